@@ -1,12 +1,9 @@
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 from typing import Any
 
-import bibtexparser
-from bibtexparser.bwriter import BibTexWriter
-from bibtexparser.bibdatabase import BibDatabase
-
 from ai_agentas.utils.citekeys import make_citekey
 
 from .parse_bibliography import ParsedReference
@@ -68,26 +65,41 @@ def _to_bib_entry(ref: ParsedReference, fallback_index: int) -> tuple[str, dict[
     return citekey, fields
 
 
+def _format_entry(ent: dict[str, Any]) -> str:
+    """
+    Suformuoja viena BibTeX bloka ranka (be bibtexparser):
+    laukai rikiuojami abecele, paskutinis be kablelio — kaip BibTexWriter.
+    """
+    lines = [f"@{ent['ENTRYTYPE']}{{{ent['ID']},"]
+    lines += [f"  {k} = {{{ent[k]}}}," for k in sorted(k for k in ent if k not in ("ENTRYTYPE", "ID"))]
+    if len(lines) > 1:
+        lines[-1] = lines[-1][:-1]
+    lines.append("}\n")
+    return "\n".join(lines)
+
+
 def export_bibtex(refs: list[ParsedReference]) -> BibtexExport:
-    db = BibDatabase()
     citekey_by_index: dict[int, str] = {}
-    entries = []
     used: set[str] = set()
+    used_counts: dict[str, int] = {}
 
+    # Rasome tiesiai i buferi irasu eiles tvarka — be tarpinio entries saraso
+    # (ir be senojo BibTexWriter rikiavimo pagal ID; tvarka sutampa su refs).
+    buf = io.StringIO()
     for i, ref in enumerate(refs):
-        ck, ent = _to_bib_entry(ref, fallback_index=i + 1)
-        base = ck
-        suffix = 0
+        base, ent = _to_bib_entry(ref, fallback_index=i + 1)
+        n = used_counts.get(base, 0)
+        ck = base if n == 0 else f"{base}{n}"
+        # Retas atvejis: sugeneruotas raktas sutampa su kita baze
         while ck in used:
-            suffix += 1
-            ck = f"{base}{suffix}"
-            ent["ID"] = ck
+            n += 1
+            ck = f"{base}{n}"
+        used_counts[base] = n + 1
         used.add(ck)
+        ent["ID"] = ck
         citekey_by_index[i] = ck
-        entries.append(ent)
+        if i:
+            buf.write("\n")
+        buf.write(_format_entry(ent))
 
-    db.entries = entries
-    writer = BibTexWriter()
-    writer.indent = "  "
-    bib = bibtexparser.dumps(db, writer)
-    return BibtexExport(bibtex=bib, citekey_by_index=citekey_by_index)
+    return BibtexExport(bibtex=buf.getvalue(), citekey_by_index=citekey_by_index)
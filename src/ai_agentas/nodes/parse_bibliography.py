@@ -1,19 +1,22 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
 import tempfile
 import urllib.parse
 import urllib.request
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 from ai_agentas.utils.bibliography import bibliography_to_entries
 from ai_agentas.utils.text_norm import norm_ws
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParsedReference:
     raw: str
     title: str | None = None
@@ -32,64 +35,147 @@ class ParsedReference:
 
 
 _YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
-_DOI_RE = re.compile(r"(?:doi\s*:\s*|https?://doi\.org/)(10\.\d{4,9}/[^\s,;]+)", re.IGNORECASE)
-_URL_RE = re.compile(r"(https?://[^\s,;]+)")
-_PAGES_RE = re.compile(r"(?:pp?\.\s*)?(\d{1,5}\s*[-–]\s*\d{1,5})")
-_VOL_ISSUE_RE = re.compile(r"(?:Vol\.?\s*)?(\d{1,4})\s*\((\d{1,4})\)")
-_VOL_ONLY_RE = re.compile(r"(?:Vol\.?\s*)(\d{1,4})")
+# Vienas sujungtas laukus istraukiantis sablonas: DOI/URL/vol(issue)/pp/metai
+# randami per viena skenavima vietoje penkiu atskiru (zr. _extract_fields).
+# DOI/URL uodegos atomines (lookahead + backreference idiom), kad regex
+# varikliui nereiketu i jas griztineti net ir ant sugadinto OCR teksto.
+# Pastaba: sablonas samoningai laikomas stdlib `re` - RE2 tipo DFA backendai
+# nepalaiko nei lookbehind (metu saka), nei backreference (atomines uodegos),
+# todel cia linijinis laikas uztikrinamas paciu sablonu konstrukcija.
+_FIELDS_RE = re.compile(
+    r"(?P<doi>(?i:doi\s*:\s*|https?://doi\.org/)10\.\d{4,9}/(?=(?P<_dt>[^\s,;]+))(?P=_dt))"
+    r"|(?P<url>https?://(?=(?P<_ut>[^\s,;]+))(?P=_ut))"
+    r"|(?:Vol\.?\s*)?(?P<vi_vol>\d{1,4})\s*\((?P<vi_issue>\d{1,4})\)"
+    r"|Vol\.?\s*(?P<vol>\d{1,4})"
+    r"|(?:pp?\.\s*)?(?P<pages>\d{1,5}\s*[-–]\s*\d{1,5})"
+    r"|(?P<year>(?<!\d)(?:19|20)\d{2}(?!\d))"
+)
 _NUM_PREFIX_RE = re.compile(r"^\s*(?:\[?\d{1,4}\]?[\.\)]\s*)")
 _QUOTED_TITLE_RE = re.compile(r"[\"'«„](.+?)[\"'»“]")
-_DOI_CLEAN_RE = re.compile(r"^https?://doi\.org/", re.IGNORECASE)
+_DOI_CLEAN_RE = re.compile(r"^(?:doi\s*:\s*|https?://doi\.org/)", re.IGNORECASE)
+_SENT_SPLIT_RE = re.compile(r"(?<=[^A-Z])\.\s+")
+_IN_JOURNAL_RE = re.compile(r"\bIn[:\s]+(.+?)(?:\.|,\s*(?:Vol|pp|\d))", re.IGNORECASE)
+_VOL_NO_PP_RE = re.compile(r"\b(vol|no|pp)\b", re.IGNORECASE)
+_AUTHOR_COMMA_SPLIT_RE = re.compile(r",\s*(?=[A-Z][a-zA-Z\-']+\s*,\s*[A-Z]\.)")
+# Autoriu separatoriai prioriteto tvarka: auksciausias esantis laimi
+# (zr. _split_authors). Buvimas nustatomas vienu finditer skenavimu.
+_AUTHOR_ANY_SEP_RE = re.compile(r"(?P<semi>; )|(?P<and> and )|(?P<amp> & )|(?P<ir> ir )", re.IGNORECASE)
+_AUTHOR_SEP_PRIORITY = tuple(
+    (kind, re.compile(re.escape(sep), re.IGNORECASE))
+    for kind, sep in (("semi", "; "), ("and", " and "), ("amp", " & "), ("ir", " ir "))
+)
+_INPROC_TAIL_RE = re.compile(r"(?:,?\s*pp?\.\s*\d|\.\s*(?:doi|https?://|ieee\b))", re.IGNORECASE)
+# OCR suklijavimu taisymo sablonai viename alternation'e (zr. _normalize_ocr_noise).
+# `yl` metu nekonsumuoja (lookahead), kad po raides iterpus tarpa `ly` dar galetu
+# atskirti metus nuo toliau einanciu raidziu ("a2024b" -> "a 2024 b").
+_OCR_FIX_RE = re.compile(
+    r"(?P<paren>[A-Za-z])\("
+    r"|(?P<ly>(?<!\d)(?:19|20)\d{2})(?=[A-Za-z])"
+    r"|(?P<yl>[A-Za-z])(?=(?:19|20)\d{2}(?!\d))"
+    r"|(?P<ls>largesparse)"
+)
 
+
+def _ocr_sub(m: re.Match) -> str:
+    kind = m.lastgroup
+    if kind == "paren":
+        return m.group("paren") + " ("
+    if kind == "ly":
+        return m.group("ly") + " "
+    if kind == "yl":
+        return m.group("yl") + " "
+    return "large sparse"
+
+# Ivestis visada praejusi norm_ws (jokiu \n, unicode tarpai sutraukti),
+# todel DOTALL nebereikalingas, o re.ASCII leidzia \s/\d be Unicode lenteliu.
+# Pastaba: inproc pavadinimo `.+?` paliktas samoningai — pavadinimuose buna
+# tasku ("U.S. ..."), tad [^.]+ klase juos sugadintu.
 _IEEE_RE = re.compile(
     r"^\s*(?:\[\d+\]\s*)?"
     r"(?P<author>[^\"“”]+?)\s*,\s*"
     r"[\"“”](?P<title>.+?)[\"“”]\s*,\s*"
-    r"(?P<rest>.+)$"
+    r"(?P<rest>[^\n]+)$",
+    re.ASCII,
 )
 _INPROC_RE = re.compile(
-    r"^\s*(?P<author>.+?)\.\s*(?P<year>(?:19|20)\d{2})\s+"
-    r"(?P<title>.+?)\.\s+In\s+(?P<rest>.+)$",
-    re.DOTALL,
+    r"^\s*(?P<author>[^\n]+?)\.\s*(?P<year>(?:19|20)\d{2})\s+"
+    r"(?P<title>.+?)\.\s+In\s+(?P<rest>[^\n]+)$",
+    re.ASCII,
 )
 _APA_RE = re.compile(
-    r"^\s*(?P<author>.+?)\s*\(\s*(?P<year>(?:19|20)\d{2}[a-z]?)\s*\)\s*\.?\s*(?P<rest>.+)$",
-    re.DOTALL,
+    r"^\s*(?P<author>[^\n]+?)\s*\(\s*(?P<year>(?:19|20)\d{2}[a-z]?)\s*\)\s*\.?\s*(?P<rest>[^\n]+)$",
+    re.ASCII,
 )
 
+# Pigus stiliaus "sniff" filtrai: kiekvienas yra butina atitinkamo pilno
+# parserio salyga, todel praleisti parseriai vis tiek nebutu suve.
+_APA_CUE_RE = re.compile(r"\(\s*(?:19|20)\d{2}")
+_INPROC_CUE_RE = re.compile(r"\.\s*(?:19|20)\d{2}\s")
 
-def _extract_doi(text: str) -> str | None:
-    m = _DOI_RE.search(text)
-    if not m:
-        return None
-    doi = m.group(1).rstrip(".,;)")
-    doi = _DOI_CLEAN_RE.sub("", doi)
-    return doi.lower()
-
+# Jei stiliaus parseris jau surinko tiek pasitikejimo, likusiu nebeleidziam
+_EARLY_EXIT_CONFIDENCE = 0.85
 
-def _extract_url(text: str) -> str | None:
-    m = _URL_RE.search(text)
-    return m.group(1).rstrip(".,;)") if m else None
 
-
-def _extract_year(text: str) -> str | None:
-    m = _YEAR_RE.search(text)
-    return m.group(1) if m else None
+@dataclass(frozen=True, slots=True)
+class _Fields:
+    doi: str | None = None
+    url: str | None = None
+    year: str | None = None
+    pages: str | None = None
+    volume: str | None = None
+    issue: str | None = None
 
 
-def _extract_pages(text: str) -> str | None:
-    m = _PAGES_RE.search(text)
-    return m.group(1) if m else None
+def _clean_doi(raw: str) -> str:
+    doi = _DOI_CLEAN_RE.sub("", raw.rstrip(".,;)"))
+    return doi.lower()
 
 
-def _extract_vol_issue(text: str) -> tuple[str | None, str | None]:
-    m = _VOL_ISSUE_RE.search(text)
-    if m:
-        return m.group(1), m.group(2)
-    m2 = _VOL_ONLY_RE.search(text)
-    if m2:
-        return m2.group(1), None
-    return None, None
+def _extract_fields(text: str) -> _Fields:
+    """
+    Istraukia DOI/URL/metus/puslapius/tomus vienu skenavimu.
+    Kiekvienam laukui imamas pirmas radinys, kaip ir atskiru sablonu atveju.
+    """
+    doi = url = year = pages = vol = issue = vol_only = None
+    for m in _FIELDS_RE.finditer(text):
+        lex = m.group(0)
+        if m.group("doi") is not None:
+            if doi is None:
+                doi = _clean_doi(lex)
+            if url is None and lex.lower().startswith("http"):
+                url = lex.rstrip(".,;)")
+        elif m.group("url") is not None:
+            if url is None:
+                url = lex.rstrip(".,;)")
+        elif m.group("vi_vol") is not None:
+            if vol is None:
+                vol, issue = m.group("vi_vol"), m.group("vi_issue")
+        elif m.group("vol") is not None:
+            if vol_only is None:
+                vol_only = m.group("vol")
+        elif m.group("pages") is not None:
+            if pages is None:
+                pages = m.group("pages")
+        else:
+            if year is None:
+                year = m.group("year")
+                continue
+        # Metai gali buti isiterpe i ilgesni radini (pvz. "2019(3)", DOI dalis).
+        # Skaitmenu ribas tikrinam originaliame tekste: lexeme'o krastai gali
+        # nukirsti ilgesne skaitmenu seka (pvz. "20194"), kurioje metu nera.
+        if year is None:
+            for ym in _YEAR_RE.finditer(lex):
+                q = m.start() + ym.start(1)
+                p = m.start() + ym.end(1)
+                if (q == 0 or not text[q - 1].isdigit()) and (
+                    p >= len(text) or not text[p].isdigit()
+                ):
+                    year = ym.group(1)
+                    break
+
+    if vol is None and vol_only is not None:
+        vol = vol_only
+    return _Fields(doi=doi, url=url, year=year, pages=pages, volume=vol, issue=issue)
 
 
 def _strip_num_prefix(text: str) -> str:
@@ -103,21 +189,26 @@ def _split_authors(author_str: str | None) -> list[str]:
     if not s:
         return []
 
-    for sep in ("; ", " and ", " & ", " ir "):
-        if sep in s.lower():
-            parts = re.split(re.escape(sep), s, flags=re.IGNORECASE)
-            out = [norm_ws(p) for p in parts if norm_ws(p)]
+    seen: set[str | None] = set()
+    for m in _AUTHOR_ANY_SEP_RE.finditer(s):
+        seen.add(m.lastgroup)
+        if m.lastgroup == "semi":
+            break
+    for kind, sep_re in _AUTHOR_SEP_PRIORITY:
+        if kind in seen:
+            parts = sep_re.split(s)
+            out = [w for w in (norm_ws(p) for p in parts) if w]
             return out if out else [s]
 
-    chunks = re.split(r",\s*(?=[A-Z][a-zA-Z\-']+\s*,\s*[A-Z]\.)", s)
+    chunks = _AUTHOR_COMMA_SPLIT_RE.split(s)
     if len(chunks) > 1:
-        return [norm_ws(c) for c in chunks if norm_ws(c)]
+        return [w for w in (norm_ws(c) for c in chunks) if w]
 
     return [s]
 
 
 _STRIP_DOI_URL_RE = re.compile(
-    r"\s*[\(\[]?\s*(?:doi\s*:\s*|https?://doi\.org/|https?://)\S+[\)\]]?$",
+    r"\s*[\(\[]?\s*(?:doi\s*:\s*|https?://doi\.org/|https?://)(?=(?P<_st>\S+))(?P=_st)[\)\]]?$",
     re.IGNORECASE,
 )
 
@@ -127,34 +218,38 @@ def _strip_doi_url_suffix(text: str) -> str:
     return _STRIP_DOI_URL_RE.sub("", text).rstrip(" .,;(")
 
 
-def _extract_title(rest: str) -> str | None:
+def _split_sentences(rest: str) -> list[str]:
+    """Sakiniu skaidymas, skaiciuojamas viena karta per irasa ir dalinamas
+    tarp _extract_title ir _extract_journal."""
+    return _SENT_SPLIT_RE.split(rest)
+
+
+def _extract_title(rest: str, sentences: list[str]) -> str | None:
     if not rest:
         return None
     q_m = _QUOTED_TITLE_RE.search(rest)
     if q_m:
         return norm_ws(_strip_doi_url_suffix(q_m.group(1)))
-    parts = re.split(r"(?<=[^A-Z])\.\s+", rest, maxsplit=1)
-    if parts:
-        candidate = norm_ws(_strip_doi_url_suffix(parts[0]))
+    if sentences:
+        candidate = norm_ws(_strip_doi_url_suffix(sentences[0]))
         if len(candidate) >= 5:
             return candidate
     return norm_ws(_strip_doi_url_suffix(rest[:200])) if len(rest) > 5 else None
 
 
-def _extract_journal(rest: str) -> str | None:
-    in_m = re.search(r"\bIn[:\s]+(.+?)(?:\.|,\s*(?:Vol|pp|\d))", rest, re.IGNORECASE)
+def _extract_journal(rest: str, sentences: list[str]) -> str | None:
+    in_m = _IN_JOURNAL_RE.search(rest)
     if in_m:
         return norm_ws(_strip_doi_url_suffix(in_m.group(1)))
 
-    parts = re.split(r"(?<=[^A-Z])\.\s+", rest)
-    if len(parts) >= 2:
-        candidate = norm_ws(_strip_doi_url_suffix(parts[1].split(",")[0]))
+    if len(sentences) >= 2:
+        candidate = norm_ws(_strip_doi_url_suffix(sentences[1].split(",")[0]))
         if 3 < len(candidate) < 120:
             return candidate
 
-    comma_parts = [norm_ws(x) for x in rest.split(",") if norm_ws(x)]
+    comma_parts = [w for w in (norm_ws(x) for x in rest.split(",")) if w]
     if len(comma_parts) >= 2 and len(comma_parts[0]) > 3:
-        if not re.search(r"\b(vol|no|pp)\b", comma_parts[0], re.IGNORECASE):
+        if not _VOL_NO_PP_RE.search(comma_parts[0]):
             return norm_ws(_strip_doi_url_suffix(comma_parts[0]))
     return None
 
@@ -164,16 +259,9 @@ def _normalize_ocr_noise(text: str) -> str:
     Lengvas, atgal suderinamas OCR/PDF triuksmo tvarkymas.
     Nekeicia strukturos, tik pataiso daznus suklijavimus.
     """
-    s = norm_ws(text)
-    # Pvz. "Privacy(sp" -> "Privacy (sp"
-    s = re.sub(r"([A-Za-z])\(", r"\1 (", s)
-    # Metai sulipdyti su raidėmis: "2024Federated" -> "2024 Federated"
-    s = re.sub(r"(?<!\d)((?:19|20)\d{2})(?=[A-Za-z])", r"\1 ", s)
-    # Raidės sulipdytos su metais: "computing2024" -> "computing 2024"
-    s = re.sub(r"([A-Za-z])((?:19|20)\d{2})(?!\d)", r"\1 \2", s)
-    # Vienas dazniausiu netycinis suklijavimas tame domene
-    s = s.replace("largesparse", "large sparse")
-    return s
+    # Visi pataisymai ("Privacy(sp", "2024Federated", "computing2024",
+    # "largesparse") pritaikomi vienu skenavimu vietoje penkiu.
+    return _OCR_FIX_RE.sub(_ocr_sub, norm_ws(text))
 
 
 def _confidence(ref: ParsedReference) -> float:
@@ -196,7 +284,7 @@ def _confidence(ref: ParsedReference) -> float:
 
 
 def _with_confidence(ref: ParsedReference) -> ParsedReference:
-    return ParsedReference(**{**ref.__dict__, "confidence": _confidence(ref)})
+    return replace(ref, confidence=_confidence(ref))
 
 
 def _parse_apa(clean: str) -> ParsedReference | None:
@@ -205,12 +293,13 @@ def _parse_apa(clean: str) -> ParsedReference | None:
         return None
     author_str = norm_ws(m.group("author"))
     rest = norm_ws(m.group("rest"))
-    title = _extract_title(rest)
+    sentences = _split_sentences(rest)
+    title = _extract_title(rest, sentences)
     year_raw = m.group("year")
     year = year_raw[:4] if year_raw else None
-    journal = _extract_journal(rest)
-    pages = _extract_pages(rest)
-    vol, issue = _extract_vol_issue(rest)
+    journal = _extract_journal(rest, sentences)
+    rest_f = _extract_fields(rest)
+    clean_f = _extract_fields(clean)
     return _with_confidence(
         ParsedReference(
             raw=clean,
@@ -219,11 +308,11 @@ def _parse_apa(clean: str) -> ParsedReference | None:
             author=author_str or None,
             authors=_split_authors(author_str),
             journal=journal,
-            volume=vol,
-            issue=issue,
-            pages=pages,
-            doi=_extract_doi(clean),
-            url=_extract_url(clean),
+            volume=rest_f.volume,
+            issue=rest_f.issue,
+            pages=rest_f.pages,
+            doi=clean_f.doi,
+            url=clean_f.url,
             parser="apa-regex",
         )
     )
@@ -236,23 +325,22 @@ def _parse_ieee(clean: str) -> ParsedReference | None:
     author_str = norm_ws(m.group("author").rstrip(","))
     title = norm_ws(m.group("title"))
     rest = norm_ws(m.group("rest"))
-    journal = _extract_journal(rest)
-    pages = _extract_pages(rest)
-    vol, issue = _extract_vol_issue(rest)
-    year = _extract_year(rest) or _extract_year(clean)
+    journal = _extract_journal(rest, _split_sentences(rest))
+    rest_f = _extract_fields(rest)
+    clean_f = _extract_fields(clean)
     return _with_confidence(
         ParsedReference(
             raw=clean,
             title=title,
-            year=year,
+            year=rest_f.year or clean_f.year,
             author=author_str or None,
             authors=_split_authors(author_str),
             journal=journal,
-            volume=vol,
-            issue=issue,
-            pages=pages,
-            doi=_extract_doi(clean),
-            url=_extract_url(clean),
+            volume=rest_f.volume,
+            issue=rest_f.issue,
+            pages=rest_f.pages,
+            doi=clean_f.doi,
+            url=clean_f.url,
             parser="ieee-regex",
         )
     )
@@ -270,17 +358,17 @@ def _parse_inproceedings(clean: str) -> ParsedReference | None:
     year = m.group("year")
     title = norm_ws(m.group("title"))
     rest = norm_ws(m.group("rest"))
-    pages = _extract_pages(rest)
-    vol, issue = _extract_vol_issue(rest)
+    rest_f = _extract_fields(rest)
+    clean_f = _extract_fields(clean)
 
     # Konferencijoms journal laukas naudojamas kaip "container/booktitle" pakaitalas
     journal = None
-    in_part = re.split(r"(?:,?\s*pp?\.\s*\d|\.\s*(?:doi|https?://|ieee\b))", rest, maxsplit=1, flags=re.IGNORECASE)[0]
+    in_part = _INPROC_TAIL_RE.split(rest, maxsplit=1)[0]
     in_part = norm_ws(in_part.rstrip(".,;"))
     if in_part and len(in_part) >= 6:
         journal = in_part
     if not journal:
-        journal = _extract_journal(rest)
+        journal = _extract_journal(rest, _split_sentences(rest))
 
     return _with_confidence(
         ParsedReference(
@@ -290,22 +378,18 @@ def _parse_inproceedings(clean: str) -> ParsedReference | None:
             author=author_str or None,
             authors=_split_authors(author_str),
             journal=journal,
-            volume=vol,
-            issue=issue,
-            pages=pages,
-            doi=_extract_doi(clean),
-            url=_extract_url(clean),
+            volume=rest_f.volume,
+            issue=rest_f.issue,
+            pages=rest_f.pages,
+            doi=clean_f.doi,
+            url=clean_f.url,
             parser="inproc-regex",
         )
     )
 
 
 def _parse_generic(clean: str) -> ParsedReference:
-    doi = _extract_doi(clean)
-    url = _extract_url(clean)
-    year = _extract_year(clean)
-    pages = _extract_pages(clean)
-    vol, issue = _extract_vol_issue(clean)
+    clean_f = _extract_fields(clean)
 
     author_str = ""
     rest = clean
@@ -321,44 +405,67 @@ def _parse_generic(clean: str) -> ParsedReference:
             author_str = norm_ws(clean[:first_dot])
             rest = norm_ws(clean[first_dot + 1 :])
 
-    title = _extract_title(rest)
-    journal = _extract_journal(rest)
+    sentences = _split_sentences(rest)
+    title = _extract_title(rest, sentences)
+    journal = _extract_journal(rest, sentences)
     return _with_confidence(
         ParsedReference(
             raw=clean,
             title=title,
-            year=year,
+            year=clean_f.year,
             author=author_str or None,
             authors=_split_authors(author_str),
             journal=journal,
-            volume=vol,
-            issue=issue,
-            pages=pages,
+            volume=clean_f.volume,
+            issue=clean_f.issue,
+            pages=clean_f.pages,
             publisher=None,
-            doi=doi,
-            url=url,
+            doi=clean_f.doi,
+            url=clean_f.url,
             parser="generic-regex",
         )
     )
 
 
-def parse_reference(raw_entry: str) -> ParsedReference:
+@functools.lru_cache(maxsize=4096)
+def _parse_reference_cached(raw_entry: str) -> ParsedReference:
     clean = _normalize_ocr_noise(_strip_num_prefix(raw_entry))
     candidates: list[ParsedReference] = []
 
-    apa = _parse_apa(clean)
-    if apa is not None:
-        candidates.append(apa)
-    ieee = _parse_ieee(clean)
-    if ieee is not None:
-        candidates.append(ieee)
-    inproc = _parse_inproceedings(clean)
-    if inproc is not None:
-        candidates.append(inproc)
+    if "(" in clean and _APA_CUE_RE.search(clean):
+        apa = _parse_apa(clean)
+        if apa is not None:
+            if apa.confidence >= _EARLY_EXIT_CONFIDENCE:
+                return replace(apa, raw=raw_entry)
+            candidates.append(apa)
+    if '"' in clean or "“" in clean or "”" in clean:
+        ieee = _parse_ieee(clean)
+        if ieee is not None:
+            if ieee.confidence >= _EARLY_EXIT_CONFIDENCE:
+                return replace(ieee, raw=raw_entry)
+            candidates.append(ieee)
+    if _INPROC_CUE_RE.search(clean):
+        inproc = _parse_inproceedings(clean)
+        if inproc is not None:
+            if inproc.confidence >= _EARLY_EXIT_CONFIDENCE:
+                return replace(inproc, raw=raw_entry)
+            candidates.append(inproc)
     candidates.append(_parse_generic(clean))
 
     best = max(candidates, key=lambda r: r.confidence)
-    return ParsedReference(**{**best.__dict__, "raw": raw_entry})
+    return replace(best, raw=raw_entry)
+
+
+def parse_reference(raw_entry: str) -> ParsedReference:
+    # Deterministine funkcija nuo raw_entry: pasikartojantys irasai
+    # (dublikatai, redagavimo ciklai) grazinami is kešo.
+    return _parse_reference_cached(raw_entry)
+
+
+def _parse_references(entries: list[str]) -> list[ParsedReference]:
+    # Grynas re/string darbas laiko GIL — gijos cia tik prideda overhead'a,
+    # tad parsinam nuosekliai (kešas parse_reference viduje dengia dublikatus).
+    return [parse_reference(e) for e in entries]
 
 
 def _csl_first_str(v: object) -> str | None:
@@ -454,7 +561,28 @@ def _ref_from_csl_item(raw: str, item: dict[str, object], *, parser_name: str) -
         conf += 0.03
     if base.year:
         conf += 0.02
-    return ParsedReference(**{**base.__dict__, "confidence": min(1.0, conf)})
+    return replace(base, confidence=min(1.0, conf))
+
+
+# AnyStyle rezultatu kesas: pakartotinis to paties dokumento parsinimas
+# (daznas redagavimo cikle) nebeleidzia Ruby proceso / HTTP uzklausos is naujo.
+_ANYSTYLE_CACHE: dict[tuple[str, str], list[ParsedReference]] = {}
+_ANYSTYLE_CACHE_MAX = 64
+
+
+def _entries_digest(entries: list[str]) -> str:
+    return hashlib.blake2b("\n".join(entries).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _anystyle_cache_get(key: tuple[str, str]) -> list[ParsedReference] | None:
+    cached = _ANYSTYLE_CACHE.get(key)
+    return list(cached) if cached is not None else None
+
+
+def _anystyle_cache_put(key: tuple[str, str], refs: list[ParsedReference]) -> None:
+    if len(_ANYSTYLE_CACHE) >= _ANYSTYLE_CACHE_MAX:
+        _ANYSTYLE_CACHE.pop(next(iter(_ANYSTYLE_CACHE)))
+    _ANYSTYLE_CACHE[key] = list(refs)
 
 
 def _parse_bibliography_anystyle_cli(entries: list[str], *, anystyle_bin: str = "anystyle") -> list[ParsedReference]:
@@ -465,6 +593,13 @@ def _parse_bibliography_anystyle_cli(entries: list[str], *, anystyle_bin: str =
     if not entries:
         return []
 
+    cache_key = (f"cli:{anystyle_bin}", _entries_digest(entries))
+    cached = _anystyle_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # anystyle `parse` argumenta traktuoja kaip failo kelia (stdin "-"
+    # konvencijos nera), tad irasai paduodami per tempfile.
     with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".txt", delete=False) as f:
         tmp_path = f.name
         for e in entries:
@@ -486,10 +621,8 @@ def _parse_bibliography_anystyle_cli(entries: list[str], *, anystyle_bin: str =
         ) from e
     finally:
         try:
-            import os
-
             os.unlink(tmp_path)
-        except Exception:
+        except OSError:
             pass
 
     if proc.returncode != 0:
@@ -514,6 +647,7 @@ def _parse_bibliography_anystyle_cli(entries: list[str], *, anystyle_bin: str =
 
         refs.append(_ref_from_csl_item(raw, item, parser_name="anystyle-cli"))
 
+    _anystyle_cache_put(cache_key, refs)
     return refs
 
 
@@ -536,6 +670,11 @@ def _parse_bibliography_anystyle_io(
     base = base_url.rstrip("/")
     url = f"{base}/parse.csl"
 
+    cache_key = (f"io:{base}", _entries_digest(entries))
+    cached = _anystyle_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     payload = urllib.parse.urlencode(
         {"input": "\n".join(entries), "access_token": access_token}
     ).encode("utf-8")
@@ -573,6 +712,7 @@ def _parse_bibliography_anystyle_io(
             continue
         refs.append(_ref_from_csl_item(raw, item, parser_name="anystyle-io"))
 
+    _anystyle_cache_put(cache_key, refs)
     return refs
 
 
@@ -641,9 +781,9 @@ def parse_bibliography_text(
             return cli_res
 
         # 3) Fallback
-        return [parse_reference(e) for e in entries]
+        return _parse_references(entries)
     if parser == "regex-ensemble":
-        return [parse_reference(e) for e in entries]
+        return _parse_references(entries)
     if parser == "anystyle":
         return _parse_bibliography_anystyle_cli(entries, anystyle_bin=anystyle_bin)
     if parser in ("anystyle-io", "anystyle-http"):
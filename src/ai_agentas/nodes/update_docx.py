@@ -15,42 +15,61 @@ class UpdateResult:
     replacements: int
 
 
-_AUTHOR_YEAR_PAREN_RE = re.compile(
-    r"\(([^()]{1,80}?),\s*((?:19|20)\d{2}|n\.d\.)\)"  # (Petrauskas, 2020)
+# Abu citatu formatai vienoje alternacijoje: (Petrauskas, 2020) arba [1] / [2, 3]
+_CITATION_RE = re.compile(
+    r"(?P<ay>\(([^()]{1,80}?),\s*((?:19|20)\d{2}|n\.d\.)\))"
+    r"|(?P<num>\[\d{1,3}(?:\s*[-–]\s*\d{1,3})?(?:\s*,\s*\d{1,3})*\])"
 )
-_NUMERIC_BRACKET_RE = re.compile(r"\[(\d{1,3}(?:\s*[-–]\s*\d{1,3})?(?:\s*,\s*\d{1,3})*)\]")
 
 
 def _replace_in_text(text: str, citekey: str) -> tuple[str, int]:
     """
     Minimalus placeholder formatas: [@citekey]
     (Pandoc/Quarto stiliaus; patogu vėliau konvertuoti)
+
+    Pakeičiama pirma rasta citata (autorius–metai ar numerinė) vienam
+    citekey kvietimui.
     """
     if not text:
         return text, 0
 
-    cnt = 0
-
-    def repl_author_year(m: re.Match) -> str:
-        nonlocal cnt
-        cnt += 1
-        return f"[@{citekey}]"
-
-    # Pakeičiam tik pirmą match'ą vienam citekey kvietimui
-    new, n = _AUTHOR_YEAR_PAREN_RE.subn(repl_author_year, text, count=1)
-    if n:
-        return new, cnt
+    m = _CITATION_RE.search(text)
+    if not m:
+        return text, 0
+    return f"{text[:m.start()]}[@{citekey}]{text[m.end():]}", 1
 
-    # Jei numerinis – irgi pakeičiam pirmą
-    def repl_num(m: re.Match) -> str:
-        nonlocal cnt
-        cnt += 1
-        return f"[@{citekey}]"
 
-    new2, n2 = _NUMERIC_BRACKET_RE.subn(repl_num, text, count=1)
-    if n2:
-        return new2, cnt
-    return text, 0
+def _replace_in_runs(para, citekey: str) -> int:
+    """
+    Pakeičia pirmą citatą redaguojant tik paliestus run'us (ne visą pastraipą):
+    išsaugomas run'ų formatavimas ir nereikia perrašyti viso pastraipos XML.
+    """
+    runs = para.runs
+    if not runs:
+        return 0
+    texts = [r.text or "" for r in runs]
+    m = _CITATION_RE.search("".join(texts))
+    if not m:
+        return 0
+
+    start, end = m.span()
+    placeholder = f"[@{citekey}]"
+    pos = 0
+    first = True
+    for r, t in zip(runs, texts):
+        run_start = pos
+        pos += len(t)
+        if pos <= start or run_start >= end:
+            continue
+        lo = max(start - run_start, 0)
+        hi = min(end - run_start, len(t))
+        if first:
+            r.text = t[:lo] + placeholder + t[hi:]
+            first = False
+        else:
+            # match tęsiasi per kelis run'us – vidinius/galinius tik išvalom
+            r.text = t[:lo] + t[hi:]
+    return 1
 
 
 def update_docx_placeholders(
@@ -94,9 +113,14 @@ def update_docx_placeholders(
         ck = next_ck()
         if ck is None:
             break
-        new, n = _replace_in_text(t, ck)
+        n = _replace_in_runs(para, ck)
+        if not n:
+            # tekstas gali būti ne run'uose (pvz., hyperlink'ai) – tada krentam
+            # atgal į pastraipos lygio pakeitimą
+            new, n = _replace_in_text(t, ck)
+            if n:
+                para.text = new
         if n:
-            para.text = new
             total_repl += n
         else:
             # jei nepavyko pakeisti – grąžinam ck atgal, kad nedingtų
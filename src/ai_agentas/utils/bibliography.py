@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
 
 from .text_norm import (
     BibliographySplit,
@@ -14,7 +18,13 @@ from .text_norm import (
 
 _BIB_ITEM_BULLET_RE = re.compile(r"^\s*(?:\[\d{1,4}\]|\d{1,4}[\.\)]|[-\u2022])\s*")
 _NUMBERED_ITEM_RE = re.compile(r"^\s*(?:\[\d{1,4}\]|\d{1,4}[\.\)])\s*")
+# Viena alternacija vietoj dvieju atskiru match'u eilutei: lastgroup pasako,
+# ar tai numerinis markeris ("num"), ar bullet ("bullet").
+_LINE_CLASS_RE = re.compile(r"^\s*(?:(?P<num>\[\d{1,4}\]|\d{1,4}[\.\)])|(?P<bullet>[-\u2022]))\s*")
 _LEADING_INDEX_RE = re.compile(r"^\s*(?:\[?\s*([0-9Il|OoS]{1,4})\s*\]?[\.\)]?)\s+")
+# OCR / zmogiskos klaidos: I,l,| -> 1 ; O,o -> 0 ; S -> 5
+_OCR_DIGIT_FIX = str.maketrans({"I": "1", "l": "1", "|": "1", "O": "0", "o": "0", "S": "5"})
+_PURE_DIGITS_RE = re.compile(r"\d{1,4}")
 _AUTHOR_START_RE = re.compile(
     r"^\s*[A-Z][A-Za-z'`\-]{1,40}\s*,\s*(?:[A-Z]\.|[A-Z][a-z]{1,30}|[A-Z]\.[A-Z]\.)"
 )
@@ -24,6 +34,8 @@ _PDF_MARGIN_NOISE_RE = re.compile(
     re.IGNORECASE,
 )
 _PAGE_NO_RE = re.compile(r"^\s*\d{1,4}\s*$")
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_DOI_URL_RE = re.compile(r"doi:|https?://", re.IGNORECASE)
 _NOISE_KEYWORDS_RE = re.compile(
     r"(?:copyright|all rights reserved|www\.[a-z0-9.-]+\.[a-z]{2,}|doi:\s*10\.|issn\b|ijarsct|journal)",
     re.IGNORECASE,
@@ -37,10 +49,8 @@ def _leading_index(line: str) -> int | None:
     g = m.group(1)
     if not g:
         return None
-    # OCR / zmogiskos klaidos: I,l,| -> 1 ; O,o -> 0 ; S -> 5
-    tr = str.maketrans({"I": "1", "l": "1", "|": "1", "O": "0", "o": "0", "S": "5"})
-    g = g.translate(tr)
-    if not re.fullmatch(r"\d{1,4}", g):
+    g = g.translate(_OCR_DIGIT_FIX)
+    if not _PURE_DIGITS_RE.fullmatch(g):
         return None
     try:
         return int(g)
@@ -85,7 +95,8 @@ def _split_unnumbered_entries(lines: list[str]) -> list[str]:
 
     def flush_local():
         nonlocal buf
-        e = " ".join(norm_ws(x) for x in buf if norm_ws(x)).strip()
+        # buf jau laiko normalizuotas eilutes
+        e = " ".join(x for x in buf if x)
         if e:
             out.append(e)
         buf = []
@@ -110,23 +121,22 @@ def _drop_repeated_page_noise(lines: list[str]) -> list[str]:
     if not lines:
         return lines
 
-    freq: dict[str, int] = {}
-    for ln in lines:
-        n = norm_ws(ln).lower()
-        if not n:
-            continue
-        freq[n] = freq.get(n, 0) + 1
+    # Normalizuojame kiekviena eilute viena karta ir naudojame abiem praeigom
+    norms = [norm_ws(ln).lower() for ln in lines]
+    freq = Counter(n for n in norms if n)
+
+    page_no_match = _PAGE_NO_RE.match
+    noise_search = _NOISE_KEYWORDS_RE.search
 
     out: list[str] = []
-    for ln in lines:
-        n = norm_ws(ln).lower()
+    for ln, n in zip(lines, norms):
         if not n:
             out.append(ln)
             continue
-        if _PAGE_NO_RE.match(n):
+        if page_no_match(n):
             continue
         # Kartojasi >1 karto ir atrodo kaip techninis triuksmas
-        if freq.get(n, 0) >= 2 and _NOISE_KEYWORDS_RE.search(n):
+        if freq[n] >= 2 and noise_search(n):
             continue
         out.append(ln)
     return out
@@ -137,28 +147,47 @@ def _find_numbered_sequence_start(lines: list[str], start_idx: int = 0) -> int |
     Randa stabilios numeruotos sekos pradzia (pvz. [1], [2], [3], ...).
     Naudinga PDF atvejams, kai tankio heuristika paslenka bibliografijos starta per velai.
     """
+    n = len(lines)
+    # Brangus darbas (regex + translate) atliekamas viena karta per eilute;
+    # triuksmo zyma skaiciuojama tingiai, nes reikia tik ne-numeruotoms eilutems.
+    indices = [_leading_index(ln) for ln in lines]
+    noise_cache: list[bool | None] = [None] * n
+
+    def _is_noise(j: int) -> bool:
+        v = noise_cache[j]
+        if v is None:
+            v = _is_probable_noise_line(lines[j])
+            noise_cache[j] = v
+        return v
+
     best_start = None
     best_hits = 0
     best_score = -10_000.0
 
-    for i in range(max(0, start_idx), len(lines)):
-        first = _leading_index(lines[i])
-        if first is None:
+    # Eilute, jau suskaiciuota kaip ankstesnio kandidato sekos "hit", pati
+    # niekada nesurinks daugiau hit'u uz ta kandidata — ja praleidziam.
+    consumed = bytearray(n)
+
+    for i in range(max(0, start_idx), n):
+        first = indices[i]
+        if first is None or consumed[i]:
             continue
         expected = first
         seq_hits = 0
         seq_gaps = 0
         noise_steps = 0
+        hit_positions: list[int] = []
         j = i
-        while j < len(lines):
-            idx = _leading_index(lines[j])
+        while j < n:
+            idx = indices[j]
             if idx is None:
-                if _is_probable_noise_line(lines[j]):
+                if _is_noise(j):
                     noise_steps += 1
                 j += 1
                 continue
             if idx == expected or idx == expected + 1 or idx == expected + 2:
                 seq_hits += 1
+                hit_positions.append(j)
                 if idx > expected:
                     seq_gaps += idx - expected
                 expected = idx + 1
@@ -166,6 +195,9 @@ def _find_numbered_sequence_start(lines: list[str], start_idx: int = 0) -> int |
                 break
             j += 1
 
+        for p in hit_positions:
+            consumed[p] = 1
+
         score = seq_hits * 1.0 - seq_gaps * 0.7 - noise_steps * 0.1
         if seq_hits > best_hits or (seq_hits == best_hits and score > best_score):
             best_hits = seq_hits
@@ -186,10 +218,10 @@ def _is_bib_item_like(line: str) -> bool:
     if _BIB_ITEM_BULLET_RE.match(line):
         return True
     # Autorius, metai...
-    if re.search(r"\b(19|20)\d{2}\b", l) and ("," in l or "." in l):
+    if _YEAR_RE.search(l) and ("," in l or "." in l):
         return True
     # DOI / URL
-    if "doi:" in l.lower() or "http://" in l.lower() or "https://" in l.lower():
+    if _DOI_URL_RE.search(l):
         return True
     return False
 
@@ -197,25 +229,31 @@ def _is_bib_item_like(line: str) -> bool:
 def _is_clearly_not_reference(entry: str) -> bool:
     """Atfiltruoja irasus, kurie tikrai nera bibliografijos saltiniai."""
     l = norm_ws(entry).lower()
-    if not l:
-        return True
-    # PDF paraščių/headerių triukšmas (pvz. "20royalsocietypublishing.org/... R. Soc. Open Sci. ...")
-    if _PDF_MARGIN_NOISE_RE.match(l):
-        return True
-    # Per trumpas
+    # Pigiausi patikrinimai pirmi (ilgis, prefiksai), regexai — tik po ju.
+    # Per trumpas (apima ir tuscia)
     if len(l) < 15:
         return True
-    # Atrodo kaip antraste / priedas / klausimas
-    if looks_like_stop_heading(entry):
-        return True
     # Interviu / klausimyno turinys
     if l.startswith("sveiki") or l.startswith("ar galite") or l.startswith("ar j"):
         return True
-    # DIDELES RAIDES be metu = greiciausiai antraste, ne saltinis
-    upper_ratio = sum(1 for c in entry if c.isupper()) / max(1, sum(1 for c in entry if c.isalpha()))
-    has_year = bool(re.search(r"\b(19|20)\d{2}\b", l))
-    if upper_ratio > 0.6 and not has_year and len(l) < 100:
+    # PDF paraščių/headerių triukšmas (pvz. "20royalsocietypublishing.org/... R. Soc. Open Sci. ...")
+    if _PDF_MARGIN_NOISE_RE.match(l):
+        return True
+    # Atrodo kaip antraste / priedas / klausimas (l jau normalizuota)
+    if looks_like_stop_heading(l):
         return True
+    has_year = bool(_YEAR_RE.search(l))
+    # DIDELES RAIDES be metu = greiciausiai antraste, ne saltinis.
+    # Skaiciuojam tik kai rezultatas gali ka nors pakeisti (nera metu, trumpa).
+    if not has_year and len(l) < 100:
+        upper = alpha = 0
+        for c in entry:
+            if c.isupper():
+                upper += 1
+            if c.isalpha():
+                alpha += 1
+        if upper / max(1, alpha) > 0.6:
+            return True
     # Nera nei metu, nei bent bazines skyrybos, nei DOI/URL
     has_punct = "." in l or "," in l or ":" in l
     has_doi_url = "doi" in l or "http" in l
@@ -243,25 +281,28 @@ def split_bibliography(text: str) -> BibliographySplit:
     if seq_start is None:
         seq_start = _find_numbered_sequence_start(lines, 0)
 
+    # Kiekviena eilute klasifikuojama lygiai viena karta; kandidatu balai
+    # toliau skaiciuojami is prefiksiniu sumu O(1) atimtimis.
+    ne_cum = array("I", accumulate((1 if norm_ws(ln) else 0 for ln in lines), initial=0))
+    bib_cum = array("I", accumulate((1 if _is_bib_item_like(ln) else 0 for ln in lines), initial=0))
+    year_cum = array("I", accumulate((1 if _YEAR_RE.search(ln) else 0 for ln in lines), initial=0))
+    stop_idxs = [j for j, ln in enumerate(lines) if looks_like_stop_heading(ln)]
+
     # 1) Ieskome visu bibliografijos antrasciu ir renkam geriausia kandidata
     heading_candidates = [i for i, ln in enumerate(lines) if looks_like_heading(ln)]
     best_heading = None  # (score, heading_idx, bib_start, bib_end)
     for h_idx in heading_candidates:
         bib_start = h_idx + 1
-        bib_end = len(lines)
-        for j in range(bib_start, len(lines)):
-            if looks_like_stop_heading(lines[j]):
-                bib_end = j
-                break
+        k = bisect_left(stop_idxs, bib_start)
+        bib_end = stop_idxs[k] if k < len(stop_idxs) else len(lines)
 
-        seg = lines[bib_start:bib_end]
-        non_empty = [ln for ln in seg if norm_ws(ln)]
-        if len(non_empty) < 3:
+        non_empty = ne_cum[bib_end] - ne_cum[bib_start]
+        if non_empty < 3:
             continue
-        bib_like = sum(1 for ln in non_empty if _is_bib_item_like(ln))
-        year_like = sum(1 for ln in non_empty if re.search(r"\b(19|20)\d{2}\b", ln))
-        density = bib_like / max(1, len(non_empty))
-        year_density = year_like / max(1, len(non_empty))
+        bib_like = bib_cum[bib_end] - bib_cum[bib_start]
+        year_like = year_cum[bib_end] - year_cum[bib_start]
+        density = bib_like / max(1, non_empty)
+        year_density = year_like / max(1, non_empty)
         score = density * 0.75 + year_density * 0.25
         if score < 0.35:
             continue
@@ -289,13 +330,13 @@ def split_bibliography(text: str) -> BibliographySplit:
     tail_start = len(lines) - min_tail
 
     best = None  # (score, start_idx_in_doc)
+    end = len(lines)
     for start in range(tail_start, len(lines)):
-        seg = lines[start:]
-        non_empty = [ln for ln in seg if norm_ws(ln)]
-        if len(non_empty) < 5:
+        non_empty = ne_cum[end] - ne_cum[start]
+        if non_empty < 5:
             continue
-        bib_like = sum(1 for ln in non_empty if _is_bib_item_like(ln))
-        score = bib_like / max(1, len(non_empty))
+        bib_like = bib_cum[end] - bib_cum[start]
+        score = bib_like / max(1, non_empty)
         if score >= 0.55:
             cand = (score, start)
             if best is None or cand[1] < best[1] or (cand[1] == best[1] and cand[0] > best[0]):
@@ -324,18 +365,24 @@ def bibliography_to_entries(bibliography_text: str) -> list[str]:
     entries: list[str] = []
     buf: list[str] = []
 
-    # PDF numeruotu sarasu rezimas: jei bent kelios eilutes prasideda "1." / "2)" / "[3]"
-    numbered_lines = sum(1 for ln in lines if _NUMBERED_ITEM_RE.match(ln))
-    numbered_mode = numbered_lines >= 2
+    # Viena klasifikacija eilutei: lastgroup "num"/"bullet" arba None.
+    class_match = _LINE_CLASS_RE.match
+    classes = [m.lastgroup if (m := class_match(ln)) else None for ln in lines]
+
+    # PDF numeruotu sarasu rezimas: jei bent kelios eilutes prasideda "1." / "2)" / "[3]".
+    # Mode turi buti zinomas pries pagrindini cikla: nuo jo priklauso, ar tuscia
+    # eilute flushina buferi, tad "gyvo" perjungimo cikle daryti negalima.
+    numbered_mode = classes.count("num") >= 2
 
     def flush():
         nonlocal buf
-        e = " ".join(norm_ws(x) for x in buf if norm_ws(x)).strip()
+        # buf laiko jau normalizuotas eilutes — jungiam be pakartotinio norm_ws
+        e = " ".join(x for x in buf if x)
         if e:
             entries.append(e)
         buf = []
 
-    def split_numbered_entries(processed: list[str]) -> list[str]:
+    def split_numbered_entries(processed: list[tuple[str, str]]) -> list[str]:
         """
         Skaido numeruotus irasus pagal markerio perejima.
         Islaiko vientisuma net jei tarp eiluciu yra tarpai ar OCR triuksmas.
@@ -346,25 +393,25 @@ def bibliography_to_entries(bibliography_text: str) -> list[str]:
 
         def flush_local():
             nonlocal local_buf
-            e = " ".join(norm_ws(x) for x in local_buf if norm_ws(x)).strip()
+            e = " ".join(x for x in local_buf if x)
             if e:
                 out.append(e)
             local_buf = []
 
-        for ln in processed:
+        for ln, normed in processed:
             idx = _leading_index(ln)
             if idx is not None and (current_idx is None or idx != current_idx):
                 flush_local()
                 current_idx = idx
-                local_buf = [ln]
+                local_buf = [normed]
                 continue
-            local_buf.append(ln)
+            local_buf.append(normed)
 
         flush_local()
         return out
 
-    processed_lines: list[str] = []
-    for ln in lines:
+    processed_pairs: list[tuple[str, str]] = []
+    for ln, cls in zip(lines, classes):
         stripped = norm_ws(ln)
         if not stripped:
             # Numeruotuose sarasuose tuscios eilutes daznai yra PDF lauzymo artefaktas.
@@ -376,19 +423,19 @@ def bibliography_to_entries(bibliography_text: str) -> list[str]:
         if looks_like_stop_heading(ln):
             flush()
             break
-        processed_lines.append(ln)
+        processed_pairs.append((ln, stripped))
         if numbered_mode:
             continue
-        if buf and _BIB_ITEM_BULLET_RE.match(ln):
+        if buf and cls is not None:
             flush()
-        buf.append(ln)
+        buf.append(stripped)
 
     flush()
 
     # Jei numeruotu eiluciu buvo pakankamai, bet del PDF lauzymo dalis irasu susiliejo,
     # atliekame papildoma skaidyma pagal numerinius markerius.
     if numbered_mode:
-        forced_entries = [norm_ws(p) for p in split_numbered_entries(processed_lines) if norm_ws(p)]
+        forced_entries = split_numbered_entries(processed_pairs)
         # Numeruotuose sarasuose filtruojame svelniau, kad neprarastume validziu irasu.
         forced_entries = [
             e
@@ -400,7 +447,7 @@ def bibliography_to_entries(bibliography_text: str) -> list[str]:
     else:
         # Nenumuotuose sarasuose daznai nera tusciu eilučių tarp irasu;
         # papildomai skaidome pagal "Author, X." pradzios signalus.
-        forced_entries = [norm_ws(p) for p in _split_unnumbered_entries(processed_lines) if norm_ws(p)]
+        forced_entries = _split_unnumbered_entries([ln for ln, _ in processed_pairs])
         if len(forced_entries) > len(entries):
             entries = forced_entries
 
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-import re
+import functools
 import unicodedata
 
+# ASCII filtras C lygyje: A-Z -> a-z, visa kita (ne a-z0-9) ismetama.
+_SLUG_LOWER = bytes.maketrans(
+    bytes(range(ord("A"), ord("Z") + 1)), bytes(range(ord("a"), ord("z") + 1))
+)
+_SLUG_DELETE = bytes(
+    b
+    for b in range(256)
+    if not (ord("a") <= b <= ord("z") or ord("0") <= b <= ord("9") or ord("A") <= b <= ord("Z"))
+)
 
+
+@functools.lru_cache(maxsize=4096)
 def _slug(s: str) -> str:
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    s = s.lower()
-    s = re.sub(r"[^a-z0-9]+", "", s)
-    return s
+    # NFKD isskaido diakritikus i kombinuojancius zenklus; encode("ascii",
+    # "ignore") juos (ir kitus ne-ASCII) ismeta, translate sutvarko likusi.
+    b = unicodedata.normalize("NFKD", s).encode("ascii", "ignore")
+    return b.translate(_SLUG_LOWER, _SLUG_DELETE).decode("ascii")
 
 
 def make_citekey(author: str | None, year: str | None, title: str | None) -> str:
@@ -17,4 +27,3 @@ def make_citekey(author: str | None, year: str | None, title: str | None) -> str
     y = _slug(year or "")[:4] or "nd"
     t = _slug(title or "")[:12] or "work"
     return f"{a}{y}{t}"
-
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import functools
 import json
+import time
+import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 from ai_agentas.nodes.parse_bibliography import ParsedReference
 from ai_agentas.utils.text_norm import norm_ws
@@ -14,7 +18,8 @@ def _ua(mailto: str | None) -> str:
     return f"{base} (mailto:{m})" if m else base
 
 
-def _get_json(url: str, *, mailto: str | None, timeout_seconds: float) -> dict:
+@functools.lru_cache(maxsize=4096)
+def _get_json_cached(url: str, mailto: str | None, timeout_seconds: float) -> dict:
     req = urllib.request.Request(
         url,
         headers={
@@ -23,9 +28,28 @@ def _get_json(url: str, *, mailto: str | None, timeout_seconds: float) -> dict:
         },
         method="GET",
     )
-    with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
-        body = resp.read().decode("utf-8", errors="replace")
-    return json.loads(body)
+    for attempt in (0, 1):
+        try:
+            with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
+                body = resp.read().decode("utf-8", errors="replace")
+            return json.loads(body)
+        except urllib.error.HTTPError as e:
+            # Crossref mandagumo politika: per 429 palaukiam ir bandome dar karta
+            if e.code != 429 or attempt:
+                raise
+            retry_after = e.headers.get("Retry-After") if e.headers else None
+            try:
+                delay = min(float(retry_after), 10.0) if retry_after else 1.0
+            except ValueError:
+                delay = 1.0
+            time.sleep(delay)
+    raise RuntimeError("unreachable")
+
+
+def _get_json(url: str, *, mailto: str | None, timeout_seconds: float) -> dict:
+    # Tas pats DOI/uzklausos URL per viena procesa parsisiunciamas tik karta.
+    # Grazinamas dict yra dalinamas — skaitytojai jo nemodifikuoja.
+    return _get_json_cached(url, mailto, timeout_seconds)
 
 
 def _first_str(v: object) -> str | None:
@@ -163,8 +187,16 @@ def enrich_refs_with_crossref(
     timeout_seconds: float = 20.0,
     rows: int = 5,
 ) -> list[ParsedReference]:
-    return [
-        enrich_reference_with_crossref(r, mailto=mailto, timeout_seconds=timeout_seconds, rows=rows)
-        for r in refs
-    ]
+    def one(r: ParsedReference) -> ParsedReference:
+        return enrich_reference_with_crossref(
+            r, mailto=mailto, timeout_seconds=timeout_seconds, rows=rows
+        )
+
+    if len(refs) <= 1:
+        return [one(r) for r in refs]
+
+    # I/O-bound: gijos persidengia tinklo latencija; 8 darbininkai —
+    # saikingas limitas pagal Crossref mandagumo politika.
+    with ThreadPoolExecutor(max_workers=min(8, len(refs))) as ex:
+        return list(ex.map(one, refs))
 
@@ -1,43 +1,104 @@
 from __future__ import annotations
 
+import mmap
+import os
 import re
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DocumentText:
     text: str
     source_path: str
     kind: str  # "docx" | "pdf" | "txt"
 
 
-def read_docx(path: str) -> DocumentText:
+# WordprocessingML vardu erdve (ta pati, kuria grazina docx.oxml.ns.qn)
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+_W_TAB = _W_NS + "tab"
+_W_TABS = _W_NS + "tabs"
+_W_BR = _W_NS + "br"
+_W_CR = _W_NS + "cr"
+
+
+def _docx_para_text(para_el) -> str:
+    frags: list[str] = []
+    for el in para_el.iter(_W_T, _W_TAB, _W_BR, _W_CR):
+        tag = el.tag
+        if tag == _W_T:
+            if el.text:
+                frags.append(el.text)
+        elif tag == _W_TAB:
+            # praleidziam tab-stop aprasus pPr viduje (w:tabs/w:tab)
+            parent = el.getparent()
+            if parent is None or parent.tag != _W_TABS:
+                frags.append("\t")
+        else:
+            frags.append("\n")
+    return "".join(frags)
+
+
+def _read_docx_xml(p: Path) -> str:
+    """Greitasis kelias: word/document.xml srautu per lxml iterparse, be
+    viso python-docx Document (relationship'u, stiliu ir t.t.) konstravimo.
+    Pastraipos (iskaitant lenteliu) ateina dokumento tvarka."""
+    import zipfile
+
+    from lxml import etree
+
+    paras: list[str] = []
+    with zipfile.ZipFile(p) as zf, zf.open("word/document.xml") as f:
+        for _, el in etree.iterparse(f, events=("end",), tag=_W_P):
+            paras.append(_docx_para_text(el))
+            el.clear()
+    return "\n".join(paras)
+
+
+def _read_docx_pythondocx(p: Path) -> str:
     from docx import Document  # python-docx
 
-    p = Path(path)
     doc = Document(str(p))
-    parts: list[str] = []
-    for para in doc.paragraphs:
-        parts.append(para.text or "")
-    # tables (dažnai literatūra nebūna, bet jei yra – įtraukiam)
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                t = (cell.text or "").strip()
-                if t:
-                    parts.append(t)
-    return DocumentText(text="\n".join(parts).strip(), source_path=str(p), kind="docx")
-
-
-_BULLET_OR_NUM_RE = re.compile(r"^\s*(?:\[\d{1,4}\]|(?:\d{1,4})[\.\)]|[-\u2022])\s*")
-_HEADING_RE = re.compile(r"^\s*(references|bibliography|literat[ūu]ra|literatura|šaltiniai|saltiniai)\s*$", re.IGNORECASE)
-_AUTHOR_COMMA_START_RE = re.compile(
-    r"^\s*[A-Z][A-Za-z'`\-]{1,40}\s*,\s*(?:[A-Z]\.|[A-Z][a-z]{1,30}|[A-Z]\.[A-Z]\.)"
+    return "\n".join(_docx_para_text(el) for el in doc.element.body.iter(_W_P))
+
+
+def read_docx(path: str | Path) -> DocumentText:
+    p = path if isinstance(path, Path) else Path(path)
+    try:
+        text = _read_docx_xml(p)
+    except Exception:
+        # Sugadintas zip/nestandartinis paketas — krentam i python-docx kelia.
+        text = _read_docx_pythondocx(p)
+    return DocumentText(text=text.strip(), source_path=str(p), kind="docx")
+
+
+# Vieniši \r -> \n (po \r\n sutvarkymo) ir NBSP -> tarpas vienu C-lygio praėjimu
+_PDF_CLEAN_TABLE = str.maketrans({"\r": "\n", "\u00a0": " "})
+# Bet koks whitespace, išskyrus \n (įskaitant unicode tarpus) — vienam bulk sub
+_INLINE_WS_RE = re.compile(r"[^\S\n]+")
+_MULTI_BLANK_RE = re.compile(r"\n{3,}")
+# Galunes, po kuriu eilutes tasos nebelipdome
+_SENTENCE_END = (".", "!", "?", ":", ";")
+# Pigi pirmo simbolio uztvara: tik sie simboliai gali pradeti bet kuri is
+# pattern'u (autoriu regex'ai ASCII-raidiniai; š/Š del "saltiniai" headingo).
+_REF_START_CHARS = frozenset(
+    "0123456789[-\u2022šŠ" + string.ascii_letters
 )
-_AUTHOR_YEAR_START_RE = re.compile(
-    r"^\s*[A-Z][A-Za-z'`\-]{2,40}\.?\s*(?:\(\s*(?:19|20)\d{2}[a-z]?\s*\)|\(\s*n\.d\.\s*\))",
-    re.IGNORECASE,
+# Visi ref-start pattern'ai vienoje alternacijoje — vienas match per eilute.
+# Case-insensitive sakos (heading'ai, autorius+metai) pazymetos (?i:...);
+# autorius+kablelis lieka case-sensitive, kaip ir atskiruose pattern'uose.
+_REF_START_RE = re.compile(
+    r"^\s*(?:"
+    r"(?:\[\d{1,4}\]|(?:\d{1,4})[\.\)]|[-\u2022])\s*"
+    r"|(?i:(?:references|bibliography|literat[ūu]ra|literatura|šaltiniai|saltiniai)\s*$)"
+    r"|[A-Z][A-Za-z'`\-]{1,40}\s*,\s*(?:[A-Z]\.|[A-Z][a-z]{1,30}|[A-Z]\.[A-Z]\.)"
+    r"|(?i:[A-Z][A-Za-z'`\-]{2,40}\.?\s*(?:\(\s*(?:19|20)\d{2}[a-z]?\s*\)|\(\s*n\.d\.\s*\)))"
+    r")"
 )
 
 
@@ -45,32 +106,33 @@ def _looks_like_reference_start(line: str) -> bool:
     s = (line or "").strip()
     if not s:
         return False
-    if _BULLET_OR_NUM_RE.match(s) or _HEADING_RE.match(s):
-        return True
-    if _AUTHOR_COMMA_START_RE.match(s):
-        return True
-    if _AUTHOR_YEAR_START_RE.match(s):
-        return True
-    return False
+    if s[0] not in _REF_START_CHARS:
+        return False
+    return _REF_START_RE.match(s) is not None
 
 
-def _normalize_pdf_text(raw_text: str) -> str:
-    """
-    Normalizuoja PDF ištrauktą tekstą į stabilesnį TXT:
-    - suvienodina tarpus;
-    - sulipdo eilučių lūžius sakinio viduryje;
-    - palieka naują eilutę prie numeruotų/bullet įrašų ir heading'ų.
-    """
+def _clean_pdf_lines(raw_text: str) -> list[str]:
+    """Bulk išvalymas: vienas translate + vienas regex praėjimas, tada
+    jau normalizuotų eilučių sąrašas. Saugu kviesti po viena puslapi."""
     if not raw_text:
-        return ""
+        return []
+    text = raw_text.replace("\r\n", "\n").translate(_PDF_CLEAN_TABLE)
+    text = _INLINE_WS_RE.sub(" ", text)
+    return [ln.strip() for ln in text.split("\n")]
 
-    text = raw_text.replace("\r\n", "\n").replace("\r", "\n").replace("\u00a0", " ")
-    lines = [ln.rstrip() for ln in text.split("\n")]
 
+def _merge_pdf_lines(lines: list[str]) -> str:
+    """
+    Sulipdo eilučių lūžius sakinio viduryje; palieka naują eilutę prie
+    numeruotų/bullet įrašų ir heading'ų. Eilutės turi būti jau išvalytos
+    per _clean_pdf_lines.
+    """
     out: list[str] = []
+    is_ref_start = _looks_like_reference_start
+    n = len(lines)
     i = 0
-    while i < len(lines):
-        ln = re.sub(r"\s+", " ", lines[i]).strip()
+    while i < n:
+        ln = lines[i]
         if not ln:
             out.append("")
             i += 1
@@ -78,60 +140,127 @@ def _normalize_pdf_text(raw_text: str) -> str:
 
         # De-hyphenation tarp eilučių: "crypto-\ncurrency" -> "cryptocurrency"
         cur = ln
-        while cur.endswith("-") and i + 1 < len(lines):
-            nxt = re.sub(r"\s+", " ", lines[i + 1]).strip()
+        while cur.endswith("-") and i + 1 < n:
+            nxt = lines[i + 1]
             if not nxt:
                 break
             cur = cur[:-1] + nxt
             i += 1
 
         # Jei kita eilutė nėra aiškiai naujo šaltinio pradžia, sulipdom kaip tąsa.
-        while i + 1 < len(lines):
-            nxt_raw = lines[i + 1]
-            nxt = re.sub(r"\s+", " ", nxt_raw).strip()
+        # Pigus endswith tikrinamas pries regex'ini ref-start testa — abiem
+        # atvejais tiesiog break'inam, tad tvarka rezultato nekeicia.
+        # Tasos kaupiamos i parts ir sujungiamos vienu join (ne kvadratine
+        # konkatenacija); paskutines dalies galune atitinka sulipdytos eilutes.
+        parts = [cur]
+        last = cur
+        while i + 1 < n:
+            nxt = lines[i + 1]
             if not nxt:
                 break
-            if _looks_like_reference_start(nxt):
+            if last.endswith(_SENTENCE_END):
                 break
-            if cur.endswith((".", "!", "?", ":", ";")):
+            if is_ref_start(nxt):
                 break
-            cur = f"{cur} {nxt}"
+            parts.append(nxt)
+            last = nxt
             i += 1
 
-        out.append(cur)
+        out.append(" ".join(parts) if len(parts) > 1 else cur)
         i += 1
 
     # Sumažinam kelių tuščių eilučių triukšmą iki vienos.
     normalized = "\n".join(out)
-    normalized = re.sub(r"\n{3,}", "\n\n", normalized)
+    normalized = _MULTI_BLANK_RE.sub("\n\n", normalized)
     return normalized.strip()
 
 
-def read_pdf(path: str) -> DocumentText:
+def _normalize_pdf_text(raw_text: str) -> str:
+    """Normalizuoja PDF ištrauktą tekstą į stabilesnį TXT."""
+    return _merge_pdf_lines(_clean_pdf_lines(raw_text))
+
+
+# Nuo kelinto puslapio apsimoka lygiagretus tekstu istraukimas
+_PDF_PARALLEL_MIN_PAGES = 8
+
+
+def _read_pdf_pages_parallel(path: str, page_count: int) -> list[str]:
+    """
+    Istraukia ir isvalo puslapius gijomis. PyMuPDF nera thread-safe ant to
+    paties Document, tad kiekviena gija atsidaro savo handle (thread-local).
+    ex.map islaiko puslapiu tvarka.
+    """
+    import fitz  # pymupdf
+
+    local = threading.local()
+    opened: list = []
+    lock = threading.Lock()
+
+    def page_lines(i: int) -> list[str]:
+        d = getattr(local, "doc", None)
+        if d is None:
+            d = fitz.open(path)
+            local.doc = d
+            with lock:
+                opened.append(d)
+        return _clean_pdf_lines(d.load_page(i).get_text("text", sort=True))
+
+    lines: list[str] = []
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+            for chunk in ex.map(page_lines, range(page_count)):
+                lines.extend(chunk)
+    finally:
+        for d in opened:
+            d.close()
+    return lines
+
+
+def read_pdf(path: str | Path) -> DocumentText:
     import fitz  # pymupdf
 
-    p = Path(path)
+    p = path if isinstance(path, Path) else Path(path)
     doc = fitz.open(str(p))
-    parts: list[str] = []
-    for page in doc:
-        # sort=True padeda nuoseklesnei skaitymo tvarkai.
-        parts.append(page.get_text("text", sort=True))
-    raw = "\n".join(parts).strip()
-    cleaned = _normalize_pdf_text(raw)
+    try:
+        page_count = doc.page_count
+        # Kiekvienas puslapis isvalomas atskirai (darbinis rinkinys ~1 puslapis,
+        # ne visas dokumentas); lūžių sulipdymas daromas karta per visas eilutes,
+        # tad įrašai per puslapių ribas jungiami kaip anksčiau.
+        lines: list[str] = []
+        if page_count < _PDF_PARALLEL_MIN_PAGES:
+            for page in doc:
+                # sort=True padeda nuoseklesnei skaitymo tvarkai.
+                lines.extend(_clean_pdf_lines(page.get_text("text", sort=True)))
+    finally:
+        doc.close()
+    if page_count >= _PDF_PARALLEL_MIN_PAGES:
+        # get_text C darbas paleidzia GIL — gijos duoda realu speedup'a
+        lines = _read_pdf_pages_parallel(str(p), page_count)
+    cleaned = _merge_pdf_lines(lines)
     return DocumentText(text=cleaned, source_path=str(p), kind="pdf")
 
 
-def read_text(path: str) -> DocumentText:
-    p = Path(path)
-    return DocumentText(text=p.read_text(encoding="utf-8", errors="ignore"), source_path=str(p), kind="txt")
+def read_text(path: str | Path) -> DocumentText:
+    p = path if isinstance(path, Path) else Path(path)
+    # mmap leidzia OS puslapiuoti dideli .txt pagal poreiki; dekoduojam vienu
+    # praėjimu vietoj read_text() tarpinio bufferio.
+    with open(p, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = mm[:].decode("utf-8", errors="ignore")
+        except ValueError:
+            # tuscio failo mmap'inti negalima
+            text = ""
+    return DocumentText(text=text, source_path=str(p), kind="txt")
 
 
-def read_any(path: str) -> DocumentText:
-    p = Path(path)
+def read_any(path: str | Path) -> DocumentText:
+    # Path konstruojamas viena karta ir paduodamas toliau
+    p = path if isinstance(path, Path) else Path(path)
     suf = p.suffix.lower()
     if suf == ".docx":
-        return read_docx(str(p))
+        return read_docx(p)
     if suf == ".pdf":
-        return read_pdf(str(p))
-    return read_text(str(p))
+        return read_pdf(p)
+    return read_text(p)
 
@@ -1,6 +1,9 @@
 """LLM (Gemini) fallback for low-confidence bibliography parsing."""
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
 import re
 
@@ -14,7 +17,55 @@ Do not add explanation, only the JSON object.
 
 Reference:
 """
-_JSON_BLOCK_RE = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", re.DOTALL)
+_BATCH_PROMPT = """Extract bibliographic fields for EACH reference below. Return ONLY a JSON array with one object per reference, in the same order. Each object has these keys (use null for missing): author, title, year, journal, volume, issue, pages, publisher, doi, url.
+Authors: separate multiple with "; ". Use "Family, Given" or "Family, G." format.
+Year: 4-digit string.
+Do not add explanation, only the JSON array.
+
+References:
+"""
+# Kiek refs sudedame i viena Gemini uzklausa (amortizuoja request overhead'a)
+_LLM_BATCH_SIZE = 8
+_AUTHOR_SPLIT_RE = re.compile(r";\s*|\s+and\s+|\s*&\s*")
+_YEAR_TOKEN_RE = re.compile(r"(?:19|20)\d{2}")
+# Vienas decoder'is visiems atsakymams: raw_decode parse'ina nuo pirmo
+# skliausto vienu praėjimu, be regex ir be pakartotinio skenavimo.
+_DECODER = json.JSONDecoder()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_model(api_key: str, model: str):
+    """Sukonfiguruoja genai ir grąžina GenerativeModel — po viena per
+    (api_key, model) pora, o ne per kiekviena kvietima."""
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model)
+
+
+# Patikslintu refs cache per procesa: tas pats raw tekstas (tam paciam
+# modeliui) kartojasi tarp dokumento versiju — pakartotinis paleidimas
+# nebekviecia Gemini. Raktas — sha1(model + raw).
+_REFINE_CACHE: dict[str, ParsedReference] = {}
+_REFINE_CACHE_MAX = 4096
+
+
+def _cache_key(model: str, raw: str) -> str:
+    return hashlib.sha1(f"{model}\x00{raw}".encode("utf-8")).hexdigest()
+
+
+def _cache_put(key: str, refined: ParsedReference) -> None:
+    if len(_REFINE_CACHE) >= _REFINE_CACHE_MAX:
+        _REFINE_CACHE.clear()
+    _REFINE_CACHE[key] = refined
+
+
+def _plausible_reference(raw: str) -> bool:
+    """Triukšmo filtras prieš Gemini kvietimą: eilutė be metų ir be nė vienos
+    didžiosios raidės pradžioje nepanaši į šaltinio įrašą — LLM jos neišgelbės."""
+    if _YEAR_TOKEN_RE.search(raw):
+        return True
+    return any(c.isupper() for c in raw[:80])
 
 
 def _parse_llm_json(text: str) -> dict | None:
@@ -22,16 +73,39 @@ def _parse_llm_json(text: str) -> dict | None:
     if not text or not text.strip():
         return None
     s = text.strip()
-    m = _JSON_BLOCK_RE.search(s)
-    if m:
+    start = s.find("{")
+    if start != -1:
         try:
-            return json.loads(m.group(0))
+            obj, _ = _DECODER.raw_decode(s, start)
+            if isinstance(obj, dict):
+                return obj
         except json.JSONDecodeError:
             pass
     try:
-        return json.loads(s)
+        data = json.loads(s)
     except json.JSONDecodeError:
         return None
+    return data if isinstance(data, dict) else None
+
+
+def _parse_llm_json_array(text: str) -> list | None:
+    """Ištraukia JSON masyvą iš LLM atsakymo (batch režimui)."""
+    if not text or not text.strip():
+        return None
+    s = text.strip()
+    start = s.find("[")
+    if start != -1:
+        try:
+            obj, _ = _DECODER.raw_decode(s, start)
+            if isinstance(obj, list):
+                return obj
+        except json.JSONDecodeError:
+            pass
+    try:
+        data = json.loads(s)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, list) else None
 
 
 def _norm(s: str | None) -> str | None:
@@ -44,40 +118,12 @@ def _norm(s: str | None) -> str | None:
 def _authors_list(author_str: str | None) -> list[str]:
     if not author_str:
         return []
-    parts = [p.strip() for p in re.split(r";\s*|\s+and\s+|\s*&\s*", author_str) if p.strip()]
+    parts = [p.strip() for p in _AUTHOR_SPLIT_RE.split(author_str) if p.strip()]
     return parts[:50]
 
 
-def refine_reference_with_llm(
-    ref: ParsedReference,
-    *,
-    api_key: str,
-    model: str = "gemini-1.5-flash",
-    max_output_tokens: int = 1024,
-) -> ParsedReference | None:
-    """
-    Siunčia ref.raw į Gemini ir grąžina ParsedReference iš LLM JSON.
-    Grąžina None jei API klaida ar nepavyksta parse'inti.
-    """
-    if not api_key or not ref.raw or len(ref.raw) < 10:
-        return None
-    try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=api_key)
-        gemini = genai.GenerativeModel(model)
-        response = gemini.generate_content(
-            _PROMPT + ref.raw[:4000],
-            generation_config={"max_output_tokens": max_output_tokens, "temperature": 0.1},
-        )
-        text = (response.text or "").strip()
-    except Exception:
-        return None
-
-    data = _parse_llm_json(text)
-    if not isinstance(data, dict):
-        return None
-
+def _merge_llm_data(ref: ParsedReference, data: dict) -> ParsedReference:
+    """Sulieja LLM grąžintus laukus su esamu ref (LLM laukai turi pirmenybę)."""
     author_str = _norm(data.get("author"))
     authors = _authors_list(author_str) if author_str else ref.authors
     if not author_str and ref.author:
@@ -113,6 +159,169 @@ def refine_reference_with_llm(
     )
 
 
+def refine_reference_with_llm(
+    ref: ParsedReference,
+    *,
+    api_key: str,
+    model: str = "gemini-1.5-flash",
+    max_output_tokens: int = 1024,
+) -> ParsedReference | None:
+    """
+    Siunčia ref.raw į Gemini ir grąžina ParsedReference iš LLM JSON.
+    Grąžina None jei API klaida ar nepavyksta parse'inti.
+    """
+    if not api_key or not ref.raw or len(ref.raw) < 10:
+        return None
+    if not _plausible_reference(ref.raw):
+        return None
+    key = _cache_key(model, ref.raw)
+    cached = _REFINE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    try:
+        gemini = _get_model(api_key, model)
+        response = gemini.generate_content(
+            _PROMPT + ref.raw[:4000],
+            generation_config={"max_output_tokens": max_output_tokens, "temperature": 0.1},
+        )
+        text = (response.text or "").strip()
+    except Exception:
+        return None
+
+    data = _parse_llm_json(text)
+    if not isinstance(data, dict):
+        return None
+    refined = _merge_llm_data(ref, data)
+    _cache_put(key, refined)
+    return refined
+
+
+def refine_batch_with_llm(
+    batch: list[ParsedReference],
+    *,
+    api_key: str,
+    model: str = "gemini-1.5-flash",
+    max_output_tokens: int = 2048,
+) -> list[ParsedReference | None]:
+    """
+    Patikslina iki keliolikos refs VIENA Gemini uzklausa (JSON masyvo atsakymas).
+    Grąžina sąrašą ta pačia tvarka; None pozicijoje reiškia "nepavyko" —
+    kvietėjas gali bandyti po vieną.
+    """
+    if not api_key or not batch:
+        return [None] * len(batch)
+    try:
+        gemini = _get_model(api_key, model)
+        prompt = _BATCH_PROMPT + "\n".join(
+            f"[{i + 1}] {r.raw[:2000]}" for i, r in enumerate(batch)
+        )
+        response = gemini.generate_content(
+            prompt,
+            generation_config={"max_output_tokens": max_output_tokens, "temperature": 0.1},
+        )
+        text = (response.text or "").strip()
+    except Exception:
+        return [None] * len(batch)
+
+    items = _parse_llm_json_array(text)
+    if not isinstance(items, list) or len(items) != len(batch):
+        return [None] * len(batch)
+    out: list[ParsedReference | None] = []
+    for r, d in zip(batch, items):
+        if isinstance(d, dict):
+            refined = _merge_llm_data(r, d)
+            _cache_put(_cache_key(model, r.raw), refined)
+            out.append(refined)
+        else:
+            out.append(None)
+    return out
+
+
+def _needs_llm(ref: ParsedReference, confidence_threshold: float) -> bool:
+    return (
+        ref.confidence < confidence_threshold
+        or not ref.title
+        or not (ref.author or ref.authors)
+    )
+
+
+async def _refine_one_async(
+    gemini,
+    ref: ParsedReference,
+    *,
+    model: str,
+    max_output_tokens: int,
+    semaphore: asyncio.Semaphore,
+) -> ParsedReference | None:
+    if not ref.raw or len(ref.raw) < 10:
+        return None
+    if not _plausible_reference(ref.raw):
+        return None
+    key = _cache_key(model, ref.raw)
+    cached = _REFINE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    try:
+        async with semaphore:
+            response = await gemini.generate_content_async(
+                _PROMPT + ref.raw[:4000],
+                generation_config={"max_output_tokens": max_output_tokens, "temperature": 0.1},
+            )
+        text = (response.text or "").strip()
+    except Exception:
+        return None
+    data = _parse_llm_json(text)
+    if not isinstance(data, dict):
+        return None
+    refined = _merge_llm_data(ref, data)
+    _cache_put(key, refined)
+    return refined
+
+
+async def refine_refs_with_llm_async(
+    refs: list[ParsedReference],
+    *,
+    api_key: str | None,
+    model: str = "gemini-1.5-flash",
+    confidence_threshold: float = 0.70,
+    max_output_tokens: int = 1024,
+    max_concurrency: int = 20,
+) -> list[ParsedReference]:
+    """
+    Kaip refine_refs_with_llm, bet Gemini kvietimai leidziami lygiagreciai
+    (tinklo latencija persidengia; semaforas riboja vienu metu atviru uzklausu
+    skaiciu). Nepavykus — paliekamas originalas.
+    """
+    if not api_key or not refs:
+        return list(refs)
+
+    need = [(i, r) for i, r in enumerate(refs) if _needs_llm(r, confidence_threshold)]
+    if not need:
+        return list(refs)
+
+    try:
+        gemini = _get_model(api_key, model)
+    except Exception:
+        return list(refs)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = await asyncio.gather(
+        *(
+            _refine_one_async(
+                gemini, r, model=model, max_output_tokens=max_output_tokens, semaphore=semaphore
+            )
+            for _, r in need
+        ),
+        return_exceptions=True,
+    )
+
+    out = list(refs)
+    for (i, _), res in zip(need, results):
+        if isinstance(res, ParsedReference):
+            out[i] = res
+    return out
+
+
 def refine_refs_with_llm(
     refs: list[ParsedReference],
     *,
@@ -128,21 +337,59 @@ def refine_refs_with_llm(
     if not api_key or not refs:
         return refs
 
-    out: list[ParsedReference] = []
-    for r in refs:
-        need_llm = (
-            r.confidence < confidence_threshold
-            or not r.title
-            or not (r.author or r.authors)
+    # Partija pirmiausiai perskirstoma: jei nera ne vieno needy ref,
+    # nekuriam nei event loop'o, nei modelio.
+    if not any(_needs_llm(r, confidence_threshold) for r in refs):
+        return list(refs)
+
+    # Jau veikiancio event loop kontekste asyncio.run negalimas — tikrinam
+    # is anksto (ne per except), kad fallback'e nesukurtume neawait'intos
+    # korutinos ir nenurytume async kelio viduje kilusiu RuntimeError.
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(
+            refine_refs_with_llm_async(
+                refs,
+                api_key=api_key,
+                model=model,
+                confidence_threshold=confidence_threshold,
+                max_output_tokens=max_output_tokens,
+            )
         )
-        if not need_llm:
-            out.append(r)
+
+    # Nuoseklus kelias: refs grupuojami po _LLM_BATCH_SIZE i viena uzklausa;
+    # nepavykusiems batch'o nariams bandome po viena.
+    out = list(refs)
+    # Triuksmas nefiltruojamas i batch'us — jis tik isptustu prompt'a;
+    # cache'o hit'ai isimami is karto, kad nepatektu i Gemini uzklausas.
+    need: list[tuple[int, ParsedReference]] = []
+    for i, r in enumerate(refs):
+        if not _needs_llm(r, confidence_threshold):
+            continue
+        if not r.raw or len(r.raw) < 10 or not _plausible_reference(r.raw):
             continue
-        refined = refine_reference_with_llm(
-            r,
+        cached = _REFINE_CACHE.get(_cache_key(model, r.raw))
+        if cached is not None:
+            out[i] = cached
+        else:
+            need.append((i, r))
+    for start in range(0, len(need), _LLM_BATCH_SIZE):
+        chunk = need[start : start + _LLM_BATCH_SIZE]
+        refined_batch = refine_batch_with_llm(
+            [r for _, r in chunk],
             api_key=api_key,
             model=model,
-            max_output_tokens=max_output_tokens,
+            max_output_tokens=max_output_tokens * len(chunk),
         )
-        out.append(refined if refined is not None else r)
+        for (i, r), refined in zip(chunk, refined_batch):
+            if refined is None:
+                refined = refine_reference_with_llm(
+                    r,
+                    api_key=api_key,
+                    model=model,
+                    max_output_tokens=max_output_tokens,
+                )
+            if refined is not None:
+                out[i] = refined
     return out
@@ -42,18 +42,27 @@ def _ascii_fold(s: str) -> str:
     return s
 
 
+# Kompaktiskos (be tarpu) antrasciu formos, paruosiamos viena karta modulio
+# lygiu — be per-call set'u konstravimo kiekvienai dokumento eilutei.
+_COMPACT_HEADINGS = frozenset(x.replace(" ", "") for x in _ALL_BIB_HEADINGS)
+_COMPACT_HEADINGS_FOLDED = frozenset(_ascii_fold(x) for x in _COMPACT_HEADINGS)
+
+_LEADING_NUM_RE = re.compile(r"^\d+[\.\)]\s*")
+_TRAILING_PUNCT_RE = re.compile(r"[:;\-–—\.\s]+$")
+
+
 def looks_like_heading(line: str) -> bool:
     """Ar eilute atrodo kaip bibliografijos skyriaus antraste."""
     l = norm_ws(line).lower()
     # Pasaliname numeracija priekyje (pvz. "5. Literatura")
-    l = re.sub(r"^\d+[\.\)]\s*", "", l).strip()
+    l = _LEADING_NUM_RE.sub("", l).strip()
     # Pasaliname gale esancius skyrybos zenklus (pvz. "LITERATURA:")
-    l = re.sub(r"[:;\-–—\.\s]+$", "", l).strip()
+    l = _TRAILING_PUNCT_RE.sub("", l).strip()
     # PDF atveju kartais buna isskaidyta raidemis: "L I T E R A T U R A"
-    compact = re.sub(r"\s+", "", l)
-    folded = _ascii_fold(compact)
-    normalized_set = {_ascii_fold(x.replace(" ", "")) for x in _ALL_BIB_HEADINGS}
-    return compact in {x.replace(" ", "") for x in _ALL_BIB_HEADINGS} or folded in normalized_set
+    compact = _WS_RE.sub("", l)
+    if compact in _COMPACT_HEADINGS:
+        return True
+    return _ascii_fold(compact) in _COMPACT_HEADINGS_FOLDED
 
 
 # Antrasciau, kuriu atsiradimas reiskia, kad bibliografija baigesi
@@ -81,14 +90,16 @@ def looks_like_stop_heading(line: str) -> bool:
 
 
 def split_lines(text: str) -> list[str]:
-    return [ln.rstrip("\n") for ln in (text or "").splitlines()]
+    # splitlines jau pasalina eiluciu galunes — papildomo rstrip nereikia,
+    # visas skaidymas lieka viename C-lygio kvietime.
+    return (text or "").splitlines()
 
 
 def join_lines(lines: list[str]) -> str:
     return "\n".join(lines)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BibliographySplit:
     body_text: str
     bibliography_text: str